@@ -0,0 +1,93 @@
+"""Запуск бенчмарков и сравнение результатов
+
+    python -m benchmarks all --fake-embeddings --output run.json
+    python -m benchmarks compare baseline.json run.json
+
+Отдельные бенчмарки с полным набором параметров:
+    python -m benchmarks.bench_startup --help
+    python -m benchmarks.bench_ingestion --help
+    python -m benchmarks.bench_generation --help
+"""
+import argparse
+import json
+
+from benchmarks import bench_generation, bench_ingestion, bench_startup
+from benchmarks.common import quiet_logging, write_results
+
+SUITES = {
+    "startup": bench_startup,
+    "ingestion": bench_ingestion,
+    "generation": bench_generation,
+}
+COMPARED_METRICS = ("p50", "p95", "p99", "seconds")
+
+
+def default_args(module, **overrides) -> argparse.Namespace:
+    """Параметры бенчмарка по умолчанию с переопределениями"""
+    parser = argparse.ArgumentParser()
+    module.add_arguments(parser)
+    args = parser.parse_args([])
+    for name, value in overrides.items():
+        if hasattr(args, name):
+            setattr(args, name, value)
+    return args
+
+
+def run_all(options) -> None:
+    quiet_logging()
+    params, results = {}, {}
+    for name in options.suites:
+        args = default_args(SUITES[name], fake_embeddings=options.fake_embeddings)
+        params[name] = vars(args)
+        results[name] = SUITES[name].run(args)
+    write_results("all", params, results, options.output)
+
+
+def collect_metrics(node, path: str = "") -> dict:
+    """Плоский словарь {путь.метрика: значение} для сравнения"""
+    metrics = {}
+    if isinstance(node, dict):
+        for key, value in node.items():
+            key_path = f"{path}.{key}" if path else key
+            if key in COMPARED_METRICS and isinstance(value, (int, float)):
+                metrics[key_path] = value
+            else:
+                metrics.update(collect_metrics(value, key_path))
+    return metrics
+
+
+def compare(options) -> None:
+    with open(options.baseline, encoding="utf-8") as f:
+        baseline = collect_metrics(json.load(f)["results"])
+    with open(options.current, encoding="utf-8") as f:
+        current = collect_metrics(json.load(f)["results"])
+
+    width = max((len(name) for name in baseline), default=10)
+    print(f"{'метрика':<{width}}  {'было, с':>12}  {'стало, с':>12}  {'изменение':>10}")
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "—"
+        print(f"{name:<{width}}  {old:>12.4f}  {new:>12.4f}  {change:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    all_parser = commands.add_parser("all", help="запустить набор бенчмарков с параметрами по умолчанию")
+    all_parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES))
+    all_parser.add_argument("--fake-embeddings", action="store_true", help="хэш-эмбеддинги вместо модели")
+    all_parser.add_argument("--output", help="файл для JSON-результатов (по умолчанию stdout)")
+    all_parser.set_defaults(handler=run_all)
+
+    compare_parser = commands.add_parser("compare", help="сравнить два JSON с результатами")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.set_defaults(handler=compare)
+
+    options = parser.parse_args()
+    options.handler(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Бенчмарк полного цикла generate_job_description с локальной LLM-заглушкой
+
+Бот направляется на MockLLMServer, векторная база строится на
+синтетическом корпусе, шаблон создается автоматически. Помимо задержки
+генерации сохраняется статистика сервера: число запросов, ответы 429,
+отправленные и сэкономленные досрочным прерыванием токены.
+
+Каждый результат открывается перед удалением: оставшиеся в нем
+плейсхолдеры (раздел не сгенерирован, бот подставил «[...]») попадают в
+failed_sections прогона. Такие прогоны не входят в сводку задержки —
+ошибка генерации обычно быстрее успешного ответа и занизила бы цифры.
+
+    python -m benchmarks.bench_generation --runs 5 --first-token-delay 0.5 --rpm 20
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from benchmarks import mock_llm
+from benchmarks.bench_ingestion import open_db
+from benchmarks.common import quiet_logging, summarize, write_results
+from benchmarks.corpus import DEPARTMENTS, POSITIONS, generate_corpus, write_template
+
+# Тот же шаблон, что в process_template бота
+PLACEHOLDER_PATTERN = re.compile(r"\[([^\]]+)\]")
+
+
+def unfilled_placeholders(path: str) -> list:
+    """Плейсхолдеры, оставшиеся в сгенерированном документе"""
+    from docx import Document
+
+    document = Document(path)
+    return [match.group(1).strip()
+            for paragraph in document.paragraphs
+            for match in PLACEHOLDER_PATTERN.finditer(paragraph.text)]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--runs", type=int, default=3, help="количество генераций")
+    parser.add_argument("--corpus-docx", type=int, default=10, help="DOCX в корпусе для RAG-контекста")
+    parser.add_argument("--api-interval", type=float, default=0,
+                        help="пауза между запросами к API в боте (в продакшене 60)")
+    parser.add_argument("--fake-embeddings", action="store_true", help="хэш-эмбеддинги вместо модели")
+    parser.add_argument("--max-retries", type=int, default=2,
+                        help="повторы клиента OpenAI при ошибках (по умолчанию как в боте)")
+    mock_llm.add_arguments(parser)
+
+
+def run(args) -> dict:
+    import bot
+    from openai import OpenAI
+
+    with tempfile.TemporaryDirectory() as workdir, mock_llm.server_from_args(args) as server:
+        documents_dir = os.path.join(workdir, "docs")
+        generate_corpus(documents_dir, args.corpus_docx, 0)
+        bot.vector_db = open_db(documents_dir, os.path.join(workdir, "db"), args.fake_embeddings)
+        bot.vector_db.index_documents()
+
+        bot.deepseek_client = OpenAI(base_url=server.base_url, api_key="benchmark",
+                                    max_retries=args.max_retries)
+        bot.TEMPLATE_PATH = os.path.join(workdir, "template.docx")
+        bot.OUTPUT_DIR = workdir
+        bot.API_REQUEST_INTERVAL = args.api_interval
+        bot.LAST_API_REQUEST_TIME = 0
+        write_template(bot.TEMPLATE_PATH)
+
+        runs = []
+        for i in range(args.runs):
+            position = POSITIONS[i % len(POSITIONS)]
+            department = DEPARTMENTS[i % len(DEPARTMENTS)]
+            start = time.perf_counter()
+            output_path = bot.generate_job_description(position, department)
+            elapsed = time.perf_counter() - start
+            failed_sections = unfilled_placeholders(output_path)
+            os.remove(output_path)
+            runs.append({"position": position, "seconds": elapsed, "failed_sections": failed_sections})
+
+        return {
+            "generate_job_description": summarize([r["seconds"] for r in runs if not r["failed_sections"]]),
+            "failed_runs": sum(1 for r in runs if r["failed_sections"]),
+            "runs": runs,
+            "server": server.stats.as_dict(),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", help="файл для JSON-результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+    quiet_logging()
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    write_results("generation", params, run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Бенчмарк индексации и поиска VectorRAGDatabase
+
+Замеряет:
+- index_documents на синтетическом корпусе DOCX/PDF;
+- update_documents без изменений (no-op) и после добавления файлов (delta);
+- скорость chunk_text;
+- задержку search_relevant_chunks (p50/p95/p99) при росте коллекции.
+
+С --fake-embeddings используется детерминированный хэш-эмбеддинг: замер
+не зависит от загрузки модели и показывает накладные расходы самой системы.
+
+    python -m benchmarks.bench_ingestion --docx 40 --pdf 10 --output ingestion.json
+"""
+import argparse
+import hashlib
+import math
+import os
+import random
+import re
+import tempfile
+import time
+
+from benchmarks.common import quiet_logging, summarize, write_results
+from benchmarks.corpus import generate_corpus, ru_sentence, ru_text
+from vector_rag_db import VectorRAGDatabase
+
+QUERIES = [
+    "требования к образованию и стажу работы для должности {position}",
+    "порядок приема и освобождения от должности {position}",
+    "знания и компетенции для должности {position}",
+    "должностные обязанности {position}",
+]
+
+
+def hash_embedding_function(dimensions: int = 256):
+    """Детерминированный эмбеддинг «мешок слов» через хэширование"""
+    from chromadb.api.types import EmbeddingFunction
+
+    class HashEmbeddingFunction(EmbeddingFunction):
+        def __init__(self):
+            pass
+
+        def __call__(self, input):
+            vectors = []
+            for text in input:
+                vector = [0.0] * dimensions
+                for word in re.findall(r"\w+", text.lower()):
+                    digest = hashlib.md5(word.encode("utf-8")).digest()
+                    vector[int.from_bytes(digest[:4], "little") % dimensions] += 1.0
+                norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+                vectors.append([v / norm for v in vector])
+            return vectors
+
+        @staticmethod
+        def name() -> str:
+            return "benchmark-hash"
+
+        def get_config(self) -> dict:
+            return {}
+
+        @staticmethod
+        def build_from_config(config):
+            return HashEmbeddingFunction()
+
+    return HashEmbeddingFunction()
+
+
+def open_db(documents_dir: str, db_path: str, fake_embeddings: bool) -> VectorRAGDatabase:
+    embedding = hash_embedding_function() if fake_embeddings else None
+    return VectorRAGDatabase(documents_dir, db_path, embedding_function=embedding)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_indexing(args, workdir: str) -> dict:
+    """index_documents, затем update_documents no-op и delta"""
+    documents_dir = os.path.join(workdir, "docs")
+    generate_corpus(documents_dir, args.docx, args.pdf, paragraphs=args.paragraphs, seed=args.seed)
+    db = open_db(documents_dir, os.path.join(workdir, "db_index"), args.fake_embeddings)
+
+    (files, chunks), index_s = timed(db.index_documents)
+    _, noop_s = timed(db.update_documents)
+
+    delta_docx = max(1, args.docx // 10)
+    delta_pdf = max(1, args.pdf // 10) if args.pdf else 0
+    generate_corpus(documents_dir, delta_docx, delta_pdf, paragraphs=args.paragraphs,
+                    seed=args.seed + 1, prefix="ДИ_новая")
+    (delta_files, delta_chunks), delta_s = timed(db.update_documents)
+
+    return {
+        "index_documents": {
+            "seconds": index_s,
+            "files": files,
+            "chunks": chunks,
+            "files_per_s": files / index_s if index_s else None,
+            "chunks_per_s": chunks / index_s if index_s else None,
+        },
+        "update_documents_noop": {"seconds": noop_s},
+        "update_documents_delta": {
+            "seconds": delta_s,
+            "files": delta_files,
+            "chunks": delta_chunks,
+        },
+    }
+
+
+def bench_chunking(args, workdir: str) -> dict:
+    """Скорость chunk_text на сплошном тексте"""
+    db = open_db(workdir, os.path.join(workdir, "db_chunk"), True)
+    text = ru_text(random.Random(args.seed), args.chunk_chars)
+    samples = []
+    chunks = []
+    for _ in range(args.repeats):
+        chunks, elapsed = timed(db.chunk_text, text)
+        samples.append(elapsed)
+    p50 = summarize(samples)["p50"]
+    return {
+        "chars": len(text),
+        "chunks": len(chunks),
+        "latency": summarize(samples),
+        "mb_per_s": len(text.encode("utf-8")) / 1e6 / p50 if p50 else None,
+    }
+
+
+def bench_search(args, workdir: str) -> dict:
+    """Задержка поиска при последовательном наращивании коллекции"""
+    db = open_db(workdir, os.path.join(workdir, "db_search"), args.fake_embeddings)
+    rng = random.Random(args.seed)
+    queries = [q.format(position=p) for q in QUERIES for p in ("инженер", "методист", "бухгалтер")]
+
+    results = {}
+    size = 0
+    for target in sorted(args.collection_sizes):
+        while size < target:
+            batch = min(args.batch_size, target - size)
+            documents = [" ".join(ru_sentence(rng) for _ in range(8)) for _ in range(batch)]
+            db.collection.add(
+                ids=[f"synthetic_{size + i}" for i in range(batch)],
+                documents=documents,
+                metadatas=[{"source": f"synthetic_{(size + i) // 20}.docx", "chunk_index": (size + i) % 20}
+                           for i in range(batch)],
+            )
+            size += batch
+
+        for query in queries[:2]:
+            db.search_relevant_chunks(query, n_results=args.n_results)
+        samples = []
+        for i in range(args.queries):
+            _, elapsed = timed(db.search_relevant_chunks, queries[i % len(queries)], n_results=args.n_results)
+            samples.append(elapsed)
+        results[str(target)] = summarize(samples)
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--docx", type=int, default=20, help="количество DOCX в корпусе")
+    parser.add_argument("--pdf", type=int, default=5, help="количество PDF в корпусе")
+    parser.add_argument("--paragraphs", type=int, default=20, help="абзацев в документе")
+    parser.add_argument("--chunk-chars", type=int, default=500_000, help="длина текста для chunk_text")
+    parser.add_argument("--repeats", type=int, default=5, help="повторов chunk_text")
+    parser.add_argument("--collection-sizes", type=int, nargs="+", default=[500, 2000, 8000],
+                        help="размеры коллекции для замеров поиска")
+    parser.add_argument("--batch-size", type=int, default=500, help="размер пакета при наполнении коллекции")
+    parser.add_argument("--queries", type=int, default=100, help="запросов на каждый размер")
+    parser.add_argument("--n-results", type=int, default=3, help="n_results в поиске (как в боте)")
+    parser.add_argument("--fake-embeddings", action="store_true", help="хэш-эмбеддинги вместо модели")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        return {
+            "indexing": bench_indexing(args, workdir),
+            "chunk_text": bench_chunking(args, workdir),
+            "search": bench_search(args, workdir),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", help="файл для JSON-результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+    quiet_logging()
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    write_results("ingestion", params, run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
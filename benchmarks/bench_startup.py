@@ -0,0 +1,90 @@
+"""Бенчмарк времени запуска: импорт модулей бота в чистом интерпретаторе
+
+Каждый замер выполняется в отдельном процессе, чтобы кэш импортов не
+влиял на результат. Перед замерами делается прогревочный запуск
+(компиляция .pyc).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_startup --runs 20 --output startup.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import REPO_ROOT, summarize, write_results
+
+MODULES = ("vector_rag_db", "bot")
+HEAVY_MODULES = ("chromadb", "PyPDF2", "docx", "win32com", "openai")
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"import_s": elapsed, "heavy_loaded": heavy}}))
+"""
+
+
+def run_probe(module: str, workdir: str) -> dict:
+    """Один запуск интерпретатора с импортом модуля"""
+    code = PROBE.format(root=REPO_ROOT, module=module, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "unknown"}
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    probe["wall_s"] = wall
+    return probe
+
+
+def bench_module(module: str, runs: int, workdir: str) -> dict:
+    """Серия замеров импорта одного модуля"""
+    warmup = run_probe(module, workdir)
+    if "error" in warmup:
+        return {"error": warmup["error"]}
+
+    import_times, wall_times = [], []
+    for _ in range(runs):
+        probe = run_probe(module, workdir)
+        if "error" in probe:
+            return {"error": probe["error"]}
+        import_times.append(probe["import_s"])
+        wall_times.append(probe["wall_s"])
+
+    return {
+        "import": summarize(import_times),
+        "process_wall": summarize(wall_times),
+        "heavy_loaded": warmup["heavy_loaded"],
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--runs", type=int, default=10, help="количество замеров на модуль")
+    parser.add_argument("--modules", nargs="+", default=list(MODULES), help="модули для замера")
+
+
+def run(args) -> dict:
+    # Импорт bot создает app.log в текущей папке — запускаем во временной
+    with tempfile.TemporaryDirectory() as workdir:
+        return {module: bench_module(module, args.runs, workdir) for module in args.modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", help="файл для JSON-результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+    write_results("startup", {"runs": args.runs, "modules": args.modules}, run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
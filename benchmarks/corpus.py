@@ -0,0 +1,155 @@
+"""Синтетический корпус должностных инструкций для бенчмарков
+
+Тексты детерминированы (seed), поэтому прогоны на разных машинах и
+коммитах сравнимы. DOCX содержат русский текст; PDF пишутся вручную
+стандартным шрифтом Helvetica, поэтому их текст латинский.
+"""
+import os
+import random
+
+RU_SUBJECTS = [
+    "Работник", "Специалист", "Инженер", "Ведущий специалист", "Начальник отдела",
+    "Заведующий лабораторией", "Методист", "Бухгалтер", "Программист", "Документовед",
+]
+RU_VERBS = [
+    "обеспечивает", "организует", "контролирует", "осуществляет", "разрабатывает",
+    "согласовывает", "готовит", "ведет учет", "анализирует", "участвует в подготовке",
+]
+RU_OBJECTS = [
+    "документации структурного подразделения", "планов работы кафедры",
+    "отчетов о выполнении поручений", "локальных нормативных актов КФУ",
+    "мероприятий по охране труда", "учебно-методических материалов",
+    "договоров с контрагентами", "сведений о персонале", "программ повышения квалификации",
+    "информационных систем университета",
+]
+RU_TAILS = [
+    "в установленные сроки", "в соответствии с Уставом КФУ",
+    "согласно требованиям законодательства Российской Федерации",
+    "по поручению непосредственного руководителя", "в пределах своей компетенции",
+]
+
+EN_WORDS = (
+    "employee ensures organizes controls develops prepares reports documents department "
+    "university regulations safety training contracts personnel systems schedule quality "
+    "compliance budget records analysis"
+).split()
+
+POSITIONS = [
+    "Инженер-программист", "Специалист по учебно-методической работе", "Документовед",
+    "Ведущий бухгалтер", "Заведующий лабораторией", "Методист",
+]
+DEPARTMENTS = [
+    "Институт вычислительной математики", "Управление кадров", "Бухгалтерия",
+    "Кафедра прикладной информатики", "Учебный отдел",
+]
+
+
+def ru_sentence(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(RU_SUBJECTS)} {rng.choice(RU_VERBS)} подготовку "
+        f"{rng.choice(RU_OBJECTS)} {rng.choice(RU_TAILS)}."
+    )
+
+
+def ru_paragraphs(rng: random.Random, paragraphs: int, sentences: int = 6) -> list:
+    return [" ".join(ru_sentence(rng) for _ in range(sentences)) for _ in range(paragraphs)]
+
+
+def ru_text(rng: random.Random, chars: int) -> str:
+    """Сплошной текст заданной длины (для замеров chunk_text)"""
+    parts, length = [], 0
+    while length < chars:
+        sentence = ru_sentence(rng)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(parts)
+
+
+def en_lines(rng: random.Random, lines: int, words: int = 12) -> list:
+    return [
+        " ".join(rng.choice(EN_WORDS) for _ in range(words)).capitalize() + "."
+        for _ in range(lines)
+    ]
+
+
+def write_docx(path: str, paragraphs: list) -> None:
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading("ДОЛЖНОСТНАЯ ИНСТРУКЦИЯ", level=1)
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    doc.save(path)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, lines: list, lines_per_page: int = 60) -> None:
+    """Минимальный PDF 1.4 с текстовым слоем (шрифт Helvetica)"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+
+    kids = []
+    for number, page_lines in enumerate(pages):
+        page_id, content_id = 4 + number * 2, 5 + number * 2
+        kids.append(f"{page_id} 0 R")
+        body = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(
+            f"({_pdf_escape(line)}) '" for line in page_lines
+        ) + " ET"
+        stream = body.encode("latin-1")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("ascii")
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream"
+        )
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode("ascii") + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode("ascii")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_corpus(directory: str, docx_count: int, pdf_count: int,
+                    paragraphs: int = 20, seed: int = 42, prefix: str = "ДИ") -> list:
+    """Создание набора DOCX/PDF, возвращает имена файлов"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    names = []
+    for i in range(docx_count):
+        name = f"{prefix}_{i:04d}.docx"
+        write_docx(os.path.join(directory, name), ru_paragraphs(rng, paragraphs))
+        names.append(name)
+    for i in range(pdf_count):
+        name = f"{prefix}_{i:04d}.pdf"
+        write_pdf(os.path.join(directory, name), en_lines(rng, paragraphs * 6))
+        names.append(name)
+    return names
+
+
+def write_template(path: str) -> None:
+    """Шаблон инструкции со всеми плейсхолдерами, которые обрабатывает бот"""
+    write_docx(path, [
+        "[Наименование должности]",
+        "Должностная инструкция [наименование должности]",
+        "[наименование структурного подразделения]",
+        "1. ОБЩИЕ ПОЛОЖЕНИЯ",
+        "[ОБЩИЕ ПОЛОЖЕНИЯ 1.2]",
+        "[ОБЩИЕ ПОЛОЖЕНИЯ 1.3]",
+        "[ОБЩИЕ ПОЛОЖЕНИЯ 1.4]",
+        "2. ДОЛЖНОСТНЫЕ ОБЯЗАННОСТИ",
+        "[ДОЛЖНОСТНЫЕ ОБЯЗАННОСТИ]",
+    ])
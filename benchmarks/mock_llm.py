@@ -0,0 +1,271 @@
+"""Локальный OpenAI-совместимый сервер, имитирующий LLM
+
+Отвечает на POST /v1/chat/completions в обычном и потоковом (SSE) режиме.
+Ответ имеет форму, характерную для deepseek-r1: секция <think>, ответ,
+маркер <end> и «хвост», который модель продолжила бы генерировать, если
+поток не прервать. Задержки и лимит запросов настраиваются, статистика
+доступна по GET /stats.
+
+Запуск отдельно (например, для ручной проверки бота):
+    python -m benchmarks.mock_llm --port 8000 --first-token-delay 0.5 --rpm 30
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+THINK_WORDS = "анализирую требования к должности и подбираю формулировки".split()
+ANSWER_WORDS = "- обеспечивает выполнение поручений руководителя в установленные сроки;".split()
+TAIL_WORDS = "дополнительно поясню что данный пункт можно расширить".split()
+
+
+def build_tokens(think_tokens: int, answer_tokens: int, tail_tokens: int) -> list:
+    """Последовательность «токенов» (слов) одного ответа"""
+    def words(source, count):
+        return [source[i % len(source)] + " " for i in range(count)]
+
+    return (
+        ["<think>"] + words(THINK_WORDS, think_tokens) + ["</think>\n"]
+        + words(ANSWER_WORDS, answer_tokens) + ["<end>"]
+        + words(TAIL_WORDS, tail_tokens)
+    )
+
+
+class MockLLMStats:
+    """Счетчики сервера (потокобезопасные)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.streams_completed = 0
+        self.streams_aborted = 0
+        self.tokens_sent = 0
+        self.tokens_saved = 0
+
+    def add(self, **counters) -> None:
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "streams_completed": self.streams_completed,
+                "streams_aborted": self.streams_aborted,
+                "tokens_sent": self.tokens_sent,
+                "tokens_saved": self.tokens_saved,
+            }
+
+
+class MockLLMServer:
+    """Сервер в фоновом потоке; base_url подходит для клиента OpenAI"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 first_token_delay: float = 0.2, token_delay: float = 0.01,
+                 rpm: int = 0, think_tokens: int = 40, answer_tokens: int = 60,
+                 tail_tokens: int = 100):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.rpm = rpm
+        self.think_tokens = think_tokens
+        self.answer_tokens = answer_tokens
+        self.tail_tokens = tail_tokens
+        self.stats = MockLLMStats()
+        self._request_times = deque()
+        self._rate_lock = threading.Lock()
+
+        handler = type("Handler", (_Handler,), {"server_state": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def check_rate_limit(self) -> float:
+        """0, если запрос разрешен, иначе время до освобождения окна (сек)"""
+        if not self.rpm:
+            return 0
+        now = time.monotonic()
+        with self._rate_lock:
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.rpm:
+                return 60 - (now - self._request_times[0])
+            self._request_times.append(now)
+            return 0
+
+    def tokens_for(self, body: dict) -> list:
+        """Ответ с учетом max_tokens и stop из запроса"""
+        tokens = build_tokens(self.think_tokens, self.answer_tokens, self.tail_tokens)
+        stop = body.get("stop") or []
+        if isinstance(stop, str):
+            stop = [stop]
+        for i, token in enumerate(tokens):
+            if any(s in token for s in stop):
+                tokens = tokens[:i]
+                break
+        max_tokens = body.get("max_tokens")
+        return tokens[:max_tokens] if max_tokens else tokens
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.server_state.stats.as_dict())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        state = self.server_state
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        state.stats.add(requests=1)
+
+        retry_after = state.check_rate_limit()
+        if retry_after:
+            state.stats.add(rate_limited=1)
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}},
+                {"Retry-After": f"{retry_after:.2f}"}
+            )
+            return
+
+        tokens = state.tokens_for(body)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "mock")
+        time.sleep(state.first_token_delay)
+
+        if body.get("stream"):
+            self._stream(completion_id, model, tokens)
+        else:
+            time.sleep(state.token_delay * len(tokens))
+            state.stats.add(tokens_sent=len(tokens))
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+
+    def _stream(self, completion_id: str, model: str, tokens: list) -> None:
+        state = self.server_state
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def event(delta: dict, finish_reason=None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+        sent = 0
+        try:
+            self.wfile.write(event({"role": "assistant", "content": ""}))
+            for token in tokens:
+                self.wfile.write(event({"content": token}))
+                self.wfile.flush()
+                sent += 1
+                time.sleep(state.token_delay)
+            self.wfile.write(event({}, "stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            state.stats.add(streams_completed=1, tokens_sent=sent)
+        except (BrokenPipeError, ConnectionResetError):
+            # Клиент закрыл поток досрочно — остаток ответа не генерируется
+            state.stats.add(streams_aborted=1, tokens_sent=sent, tokens_saved=len(tokens) - sent)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="задержка до первого токена, сек")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="задержка между токенами, сек")
+    parser.add_argument("--rpm", type=int, default=0, help="лимит запросов в минуту (0 — без лимита)")
+    parser.add_argument("--think-tokens", type=int, default=40, help="длина секции <think>")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="длина ответа до <end>")
+    parser.add_argument("--tail-tokens", type=int, default=100, help="токены после <end>")
+
+
+def server_from_args(args, host: str = "127.0.0.1", port: int = 0) -> MockLLMServer:
+    return MockLLMServer(
+        host=host, port=port,
+        first_token_delay=args.first_token_delay, token_delay=args.token_delay,
+        rpm=args.rpm, think_tokens=args.think_tokens,
+        answer_tokens=args.answer_tokens, tail_tokens=args.tail_tokens,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"Mock LLM: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
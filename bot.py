@@ -1,20 +1,14 @@
+from __future__ import annotations
+
 import os
 import re
-import json
-from docx import Document
-import chromadb
-from chromadb.utils import embedding_functions
-import hashlib
-import win32com.client
-from openai import OpenAI
 import time
 import logging
 import traceback
-import sys
-from docx.shared import Pt
-import PyPDF2
-import textwrap
-from collections import deque
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from vector_rag_db import VectorRAGDatabase
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import (
@@ -26,6 +20,9 @@ from telegram.ext import (
     ConversationHandler
 )
 
+if TYPE_CHECKING:
+    from docx import Document
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -43,22 +40,235 @@ OUTPUT_DIR = r"ПОЛНЫЙ ПУТЬ К ПАПКЕ ГДЕ БУДУТ ХРАНИ
 TEMPLATE_PATH = r"ПОЛНЫЙ ПУТЬ К ДОКУМЕНТУ Шаблон.docx"
 TOKEN = "ТОКЕН ТЕЛЕГРАМ БОТА"
 
+LLM_MODEL = "deepseek-r1-distill-llama-70b"
+API_REQUEST_INTERVAL = 60
+PROGRESS_UPDATE_INTERVAL = 2.0
+THINK_CLOSE_TAG = "</think>"
+END_MARKER = "<end>"
+
 LAST_API_REQUEST_TIME = 0
 vector_db = None
 deepseek_client = None
+_init_executor = None
+_init_futures = {}
+
+def init_llm_client():
+    """Инициализация клиента LLM"""
+    global deepseek_client
+    from openai import OpenAI
 
-def init_system():
-    """Инициализация системных компонентов"""
-    global vector_db, deepseek_client
-    
     deepseek_client = OpenAI(
         base_url="ССЫЛКА SCALEWAY",
         api_key="API КЛЮЧ"
     )
-    
+    logger.info("Клиент LLM инициализирован")
+
+def init_vector_db():
+    """Инициализация векторной базы"""
+    global vector_db
+
     vector_db = VectorRAGDatabase(DOCUMENTS_DIR, VECTOR_DB_PATH)
+    logger.info("Векторная база подключена")
+
+def init_system():
+    """Инициализация системных компонентов"""
+    init_llm_client()
+    init_vector_db()
     logger.info("Системные компоненты инициализированы")
 
+def _log_init_result(future) -> None:
+    """Логирование ошибки фоновой инициализации сразу при ее возникновении"""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Ошибка фоновой инициализации: {str(error)}", exc_info=error)
+
+def _submit_init(init_func) -> None:
+    future = _init_executor.submit(init_func)
+    future.add_done_callback(_log_init_result)
+    _init_futures[init_func] = future
+
+def start_background_init():
+    """Фоновая инициализация компонентов, пока бот уже принимает сообщения"""
+    global _init_executor
+
+    _init_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="init")
+    for init_func in (init_llm_client, init_vector_db):
+        _submit_init(init_func)
+    logger.info("Запущена фоновая инициализация системных компонентов")
+
+def system_ready() -> bool:
+    """Все компоненты успешно инициализированы"""
+    if not _init_futures:
+        return vector_db is not None and deepseek_client is not None
+    return all(
+        future.done() and future.exception() is None
+        for future in _init_futures.values()
+    )
+
+async def wait_for_system_ready() -> None:
+    """Ожидание фоновой инициализации; неудавшиеся шаги запускаются повторно"""
+    if not _init_futures:
+        if not system_ready():
+            await asyncio.to_thread(init_system)
+        return
+
+    for init_func, future in list(_init_futures.items()):
+        if future.done() and future.exception() is not None:
+            logger.info(f"Повторная инициализация: {init_func.__name__}")
+            _submit_init(init_func)
+    await asyncio.gather(*(asyncio.wrap_future(future) for future in _init_futures.values()))
+
+class ThinkStreamFilter:
+    """Отделение секции <think> от ответа при потоковой генерации"""
+
+    def __init__(self):
+        self.raw = ""
+        self._answer_start = None
+
+    def feed(self, delta: str) -> None:
+        """Добавление очередного фрагмента потока"""
+        search_from = max(0, len(self.raw) - len(THINK_CLOSE_TAG) + 1)
+        self.raw += delta
+        idx = self.raw.rfind(THINK_CLOSE_TAG, search_from)
+        if idx != -1:
+            self._answer_start = idx + len(THINK_CLOSE_TAG)
+
+    @property
+    def in_answer(self) -> bool:
+        """Секция размышлений завершена, идет ответ"""
+        return self._answer_start is not None
+
+    @property
+    def answer(self) -> str:
+        """Текст после последнего </think> (или весь текст, если тега не было)"""
+        text = self.raw[self._answer_start:] if self.in_answer else self.raw
+        return text.split(END_MARKER)[0]
+
+    @property
+    def ended(self) -> bool:
+        """Модель отметила конец ответа маркером END_MARKER"""
+        return self.in_answer and END_MARKER in self.raw[self._answer_start:]
+
+class GenerationProgress:
+    """Отображение прогресса генерации в одном статусном сообщении Telegram"""
+
+    STATES = {
+        "waiting": "⏳ ожидание очереди API",
+        "thinking": "🤔 анализ ({chars} симв.)",
+        "writing": "✍️ написание ({chars} симв.)",
+        "done": "✅ готово",
+        "error": "⚠️ ошибка",
+    }
+
+    def __init__(self, message, loop, header: str, interval: float = PROGRESS_UPDATE_INTERVAL):
+        self.message = message
+        self.loop = loop
+        self.header = header
+        self.interval = interval
+        self.sections = {}
+        self._lock = threading.Lock()
+        self._edit_lock = None
+        self._last_update = 0
+        self._last_text = header
+
+    def __call__(self, section: str, state: str, chars: int = 0) -> None:
+        """Обновление состояния раздела (вызывается из рабочего потока)"""
+        with self._lock:
+            previous = self.sections.get(section)
+            self.sections[section] = (state, chars)
+            state_changed = previous is None or previous[0] != state
+
+            now = time.time()
+            if not state_changed and now - self._last_update < self.interval:
+                return
+
+            text = self._render()
+            if text == self._last_text:
+                return
+            self._last_update = now
+            self._last_text = text
+
+        asyncio.run_coroutine_threadsafe(self._edit(text), self.loop)
+
+    def _render(self) -> str:
+        lines = [
+            f"{section}: {self.STATES[state].format(chars=chars)}"
+            for section, (state, chars) in self.sections.items()
+        ]
+        return self.header + "\n\n" + "\n".join(lines)
+
+    async def _edit(self, text: str) -> None:
+        if self._edit_lock is None:
+            self._edit_lock = asyncio.Lock()
+        async with self._edit_lock:
+            try:
+                await self.message.edit_text(text)
+            except Exception as e:
+                logger.warning(f"Не удалось обновить статус: {str(e)}")
+
+def wait_for_api_slot(progress=None, section: str = None) -> None:
+    """Соблюдение интервала между запросами к API"""
+    global LAST_API_REQUEST_TIME
+
+    if LAST_API_REQUEST_TIME > 0:
+        elapsed = time.time() - LAST_API_REQUEST_TIME
+        if elapsed < API_REQUEST_INTERVAL:
+            sleep_time = API_REQUEST_INTERVAL - elapsed
+            logger.info(f"Ожидание {sleep_time:.2f} сек перед запросом...")
+            if progress:
+                progress(section, "waiting")
+            time.sleep(sleep_time)
+
+    LAST_API_REQUEST_TIME = time.time()
+
+def stream_completion(messages: list, max_tokens: int, temperature: float,
+                      stop: list = None, is_complete=None, on_update=None) -> ThinkStreamFilter:
+    """Потоковая генерация с отсечением <think> и досрочным завершением"""
+    params = {
+        "model": LLM_MODEL,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "stream": True,
+    }
+    if stop:
+        params["stop"] = stop
+
+    stream = deepseek_client.chat.completions.create(**params)
+    parser = ThinkStreamFilter()
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+
+            parser.feed(delta)
+            if on_update:
+                on_update(parser)
+
+            if parser.ended or (parser.in_answer and is_complete and is_complete(parser.answer)):
+                logger.info("Ответ получен полностью, поток прерван досрочно")
+                break
+    finally:
+        stream.close()
+
+    return parser
+
+def progress_updater(progress, section: str):
+    """Колбэк потока, транслирующий состояние генерации в прогресс"""
+    if not progress:
+        return None
+
+    def on_update(parser: ThinkStreamFilter) -> None:
+        if parser.in_answer:
+            progress(section, "writing", len(parser.answer))
+        else:
+            progress(section, "thinking", len(parser.raw))
+
+    return on_update
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Начало диалога"""
     await update.message.reply_text(
@@ -80,14 +290,19 @@ async def get_department(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     position = context.user_data['position']
     department = context.user_data['department']
     
-    await update.message.reply_text(
+    header = (
         f"Начинаю генерацию инструкции для:\n"
         f"Должность: {position}\n"
         f"Подразделение: {department}\n"
         "Это займет несколько минут..."
     )
+    status_message = await update.message.reply_text(header)
+    progress = GenerationProgress(status_message, asyncio.get_running_loop(), header)
     try:
-        output_path = generate_job_description(position, department)
+        if not system_ready():
+            await status_message.edit_text(header + "\n\nСистема еще загружается, генерация начнется автоматически...")
+        await wait_for_system_ready()
+        output_path = await asyncio.to_thread(generate_job_description, position, department, progress)
         with open(output_path, 'rb') as doc_file:
             await update.message.reply_document(
                 document=doc_file,
@@ -108,15 +323,15 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     )
     return ConversationHandler.END
 
-def generate_job_description(position: str, department: str) -> str:
+def generate_job_description(position: str, department: str, progress=None) -> str:
     """Генерация документа (адаптированная версия вашей main)"""
-    global LAST_API_REQUEST_TIME
-    
+    from docx import Document
+
     template_doc = Document(TEMPLATE_PATH)
     if not template_doc:
         raise Exception("Не удалось загрузить шаблон")
     
-    processed_doc = process_template(template_doc, position, department)
+    processed_doc = process_template(template_doc, position, department, progress)
     if not processed_doc:
         raise Exception("Ошибка обработки шаблона")
     
@@ -128,22 +343,38 @@ def generate_job_description(position: str, department: str) -> str:
     
     return output_path
 
-def to_accusative_via_llm(phrase: str) -> str:
+ACCUSATIVE_PREFIXES = ["родительный падеж:", "Ответ:", "Результат:", "'ответ'", "•", "-", "'"]
+
+def clean_accusative_line(line: str) -> str:
+    """Удаление служебных префиксов и кавычек из строки ответа"""
+    generated_text = line.strip()
+    for prefix in ACCUSATIVE_PREFIXES:
+        if generated_text.startswith(prefix):
+            generated_text = generated_text[len(prefix):].strip()
+
+    if generated_text.startswith('"') and generated_text.endswith('"'):
+        generated_text = generated_text[1:-1].strip()
+    elif generated_text.startswith("'") and generated_text.endswith("'"):
+        generated_text = generated_text[1:-1].strip()
+    return generated_text
+
+def first_accusative_line(answer: str, complete_only: bool = False) -> str:
+    """Первая строка ответа, в которой после удаления префиксов остался текст"""
+    lines = answer.split("\n")
+    if complete_only:
+        lines = lines[:-1]
+    for line in lines:
+        generated_text = clean_accusative_line(line)
+        if generated_text:
+            return generated_text
+    return ""
+
+def to_accusative_via_llm(phrase: str, progress=None, section: str = "Наименование должности") -> str:
     """Преобразует фразу в родительный падеж с помощью LLM"""
-    global LAST_API_REQUEST_TIME
     try:
         logger.info(f"Запрос к LLM для преобразования в родительный падеж: {phrase}")
 
-
-        current_time = time.time()
-        if LAST_API_REQUEST_TIME > 0:
-            elapsed = current_time - LAST_API_REQUEST_TIME
-            if elapsed < 60:  
-                sleep_time = 60 - elapsed
-                logger.info(f"Ожидание {sleep_time:.2f} сек перед запросом...")
-                time.sleep(sleep_time)
-        
-        LAST_API_REQUEST_TIME = time.time()
+        wait_for_api_slot(progress, section)
 
         prompt = (
             "<think>\n"
@@ -154,8 +385,7 @@ def to_accusative_via_llm(phrase: str) -> str:
             f"родительный падеж: "
         )
         
-        response = deepseek_client.chat.completions.create(
-            model="deepseek-r1-distill-llama-70b",
+        parser = stream_completion(
             messages=[
                 {
                     "role": "system", 
@@ -169,33 +399,35 @@ def to_accusative_via_llm(phrase: str) -> str:
             ],
             max_tokens=50,
             temperature=0.0,
-            stop=["<end>"] 
+            stop=[END_MARKER],
+            # Ответ — одна строка: как только завершена строка с содержимым, дальше не читаем
+            is_complete=lambda answer: bool(first_accusative_line(answer, complete_only=True)),
+            on_update=progress_updater(progress, section)
         )
         
-        result = response.choices[0].message.content.strip()
+        result = parser.answer.strip()
         
-        if "</think>" in result:
-            generated_text = result.split("</think>")[-1].strip()
-            
-            prefixes = ["родительный падеж:", "Ответ:", "Результат:", "'ответ'", "•", "-", "'"]
-            for prefix in prefixes:
-                if generated_text.startswith(prefix):
-                    generated_text = generated_text[len(prefix):].strip()
-            
-            if generated_text.startswith('"') and generated_text.endswith('"'):
-                generated_text = generated_text[1:-1].strip()
-            elif generated_text.startswith("'") and generated_text.endswith("'"):
-                generated_text = generated_text[1:-1].strip()
+        if parser.in_answer:
+            generated_text = first_accusative_line(result)
+            if not generated_text:
+                logger.warning(f"Пустой ответ LLM, используется исходная фраза: {phrase}")
+                generated_text = phrase
                 
             logger.info(f"Преобразовано в родительный падеж: {phrase} -> {generated_text}")
+            if progress:
+                progress(section, "done")
             return generated_text
         else:
-            clean_result = re.sub(r'</?[a-z]+>', '', result, flags=re.IGNORECASE)
+            clean_result = re.sub(r'</?[a-z]+>', '', result, flags=re.IGNORECASE).strip() or phrase
             logger.info(f"Преобразовано без тега: {phrase} -> {clean_result}")
+            if progress:
+                progress(section, "done")
             return clean_result
     
     except Exception as e:
         logger.error(f"Ошибка преобразования в родительный падеж: {str(e)}")
+        if progress:
+            progress(section, "error")
         return phrase 
 
 PLACEHOLDER_CONFIG = {
@@ -217,9 +449,8 @@ PLACEHOLDER_CONFIG = {
     }
 }
 
-def generate_placeholder_content(placeholder: str, context: dict) -> str:
+def generate_placeholder_content(placeholder: str, context: dict, progress=None) -> str:
     """Генерация содержания с использованием RAG"""
-    global LAST_API_REQUEST_TIME
     try:
         logger.info(f"Генерация для плейсхолдера: [{placeholder}]")
         
@@ -252,38 +483,31 @@ def generate_placeholder_content(placeholder: str, context: dict) -> str:
         
         logger.info(f"Промпт для генерации: {full_prompt[:500]}...")
 
-        current_time = time.time()
-        if LAST_API_REQUEST_TIME > 0:
-            elapsed = current_time - LAST_API_REQUEST_TIME
-            if elapsed < 60: 
-                sleep_time = 60
-                logger.info(f"Ожидание {sleep_time:.2f} сек перед запросом...")
-                time.sleep(sleep_time)
-        
-        LAST_API_REQUEST_TIME = time.time()
+        wait_for_api_slot(progress, placeholder)
 
-        response = deepseek_client.chat.completions.create(
-            model="deepseek-r1-distill-llama-70b",
+        parser = stream_completion(
             messages=[
                 {
                     "role": "system", 
                     "content": (
                         "Ты HR-специалист, составляющий должностные инструкции. "
-                        "Используй юридические формулировки и только русский язык."
+                        "Используй юридические формулировки и только русский язык. "
+                        f"Когда ответ полностью готов, напиши {END_MARKER}."
                     )
                 },
                 {"role": "user", "content": full_prompt}
             ],
             max_tokens=1500,
-            temperature=0.3
+            temperature=0.3,
+            on_update=progress_updater(progress, placeholder)
         )
         
-        result = response.choices[0].message.content.strip()
-        if "</think>" in result:
+        result = parser.answer.strip()
+        if progress:
+            progress(placeholder, "done")
+        if parser.in_answer:
 
-            generated_text = result.split("</think>")[-1].strip()
-
-            generated_text = re.sub(r'</?[a-z]+>', '', generated_text, flags=re.IGNORECASE)
+            generated_text = re.sub(r'</?[a-z]+>', '', result, flags=re.IGNORECASE)
             logger.info(f"Отфильтрованный контент: {generated_text[:100]}...")
             return generated_text
         else:
@@ -293,19 +517,23 @@ def generate_placeholder_content(placeholder: str, context: dict) -> str:
     except Exception as e:
         logger.error(f"Ошибка генерации: {str(e)}")
         logger.error(traceback.format_exc())
+        if progress:
+            progress(placeholder, "error")
         return f"[{placeholder}]"          
 
 
 def read_docx(file_path: str) -> Document:
     """Чтение .docx файла"""
     try:
+        from docx import Document
+
         logger.info(f"Чтение .docx файла: {os.path.basename(file_path)}")
         return Document(file_path)
     except Exception as e:
         logger.error(f"Ошибка чтения DOCX: {str(e)}")
         return None
 
-def process_template(template_doc: Document, position: str, department: str) -> Document:
+def process_template(template_doc: Document, position: str, department: str, progress=None) -> Document:
     """Обработка шаблона с заменой плейсхолдеров"""
     try:
         logger.info("Начало обработки шаблона...")
@@ -325,14 +553,14 @@ def process_template(template_doc: Document, position: str, department: str) ->
                     
                     if "наименование должности" in placeholder_name.lower():
                         is_uppercase = placeholder_name[0].isupper()
-                        return position if is_uppercase else to_accusative_via_llm(position)
+                        return position if is_uppercase else to_accusative_via_llm(position, progress, placeholder_name)
                             
                     elif "наименование кафедры" in placeholder_name.lower():
                         return department
                     elif "наименование структурного подразделения" in placeholder_name.lower():
                         return department
                     
-                    return generate_placeholder_content(placeholder_name, context)
+                    return generate_placeholder_content(placeholder_name, context, progress)
                 
                 paragraph.text = placeholder_pattern.sub(replace_placeholder, paragraph.text)
         
@@ -359,7 +587,7 @@ def main() -> None:
     """Запуск бота"""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    init_system()
+    start_background_init()
     
     application = Application.builder().token(TOKEN).build()
     
@@ -0,0 +1,606 @@
+import os
+import re
+import signal
+import struct
+import logging
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 120
+WD_FORMAT_DOCX = 16
+WORD_PROCESS_NAME = "winword.exe"
+PROCESS_QUERY_INFORMATION = 0x0400
+PROCESS_VM_READ = 0x0010
+
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+MAXREGSECT = 0xFFFFFFFA
+NOSTREAM = 0xFFFFFFFF
+STGTY_STREAM = 2
+
+WORD_IDENT = 0xA5EC
+MIN_WORD97_NFIB = 0xC1
+FIB_FLAG_ENCRYPTED = 0x0100
+FIB_FLAG_WHICH_TABLE = 0x0200
+FC_CLX_INDEX = 33
+FC_COMPRESSED = 0x40000000
+FC_MASK = 0x3FFFFFFF
+
+FIELD_BEGIN, FIELD_SEPARATOR, FIELD_END = "\x13", "\x14", "\x15"
+CONTROL_CHARS = {
+    "\r": "\n",
+    "\x07": "\n",
+    "\x0b": "\n",
+    "\x0c": "\n",
+    "\x1e": "-",
+    "\x1f": "",
+    "\xa0": " ",
+}
+CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0e-\x1f]")
+
+
+class DocConversionError(Exception):
+    """Ошибка чтения или конвертации .doc"""
+
+
+class DocSessionError(DocConversionError):
+    """Сессия Word упала и будет запущена заново"""
+
+
+class DocConverter:
+    """Базовый конвертер .doc: извлечение текста и конвертация в .docx"""
+
+    name = "base"
+
+    def extract_text(self, doc_path: str) -> str:
+        """Извлечение текста из .doc"""
+        raise NotImplementedError
+
+    def convert_to_docx(self, doc_path: str, output_path: str = None) -> str:
+        """Конвертация .doc в .docx (исходный файл не удаляется)
+
+        Базовая реализация переносит только текст, без форматирования.
+        """
+        from docx import Document
+
+        output_path = output_path or doc_path + "x"
+        text = self.extract_text(doc_path)
+        doc = Document()
+        for line in text.split("\n"):
+            doc.add_paragraph(line)
+        doc.save(output_path)
+        return output_path
+
+    def _call(self, func, *args, timeout: float = None):
+        """Выполнение операции над документом с таймаутом
+
+        Операция идет в фоновом daemon-потоке: зависший разбор поврежденного
+        файла не останавливает пакет и не мешает завершению процесса.
+        """
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = func(*args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=target, name=f"{self.name}-doc", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            raise DocConversionError(f"Обработка не завершилась за {timeout} сек")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def extract_batch(self, doc_paths: list, timeout: float = DEFAULT_TIMEOUT) -> dict:
+        """Извлечение текста из набора файлов: {путь: текст}, при ошибке — пустая строка"""
+        return self._run_batch(self.extract_text, doc_paths, timeout, default="")
+
+    def convert_batch(self, doc_paths: list, timeout: float = DEFAULT_TIMEOUT) -> dict:
+        """Конвертация набора файлов: {путь .doc: путь .docx}, при ошибке — None"""
+        return self._run_batch(self.convert_to_docx, doc_paths, timeout, default=None)
+
+    def _run_batch(self, func, doc_paths: list, timeout: float, default) -> dict:
+        results = {}
+        for doc_path in doc_paths:
+            for attempt in (1, 2):
+                try:
+                    results[doc_path] = self._call(func, doc_path, timeout=timeout)
+                    break
+                except DocSessionError as e:
+                    # Сессия уже перезапущена — одна повторная попытка
+                    logger.error(f"Сбой сессии на {os.path.basename(doc_path)} (попытка {attempt}): {str(e)}")
+                    results[doc_path] = default
+                except Exception as e:
+                    logger.error(f"Ошибка обработки {os.path.basename(doc_path)}: {str(e)}")
+                    results[doc_path] = default
+                    break
+        return results
+
+    def close(self) -> None:
+        """Освобождение ресурсов конвертера"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _CompoundFile:
+    """Минимальный читатель OLE Compound File (контейнер Word 97-2003)"""
+
+    def __init__(self, data: bytes):
+        if data[:8] != OLE_SIGNATURE:
+            raise DocConversionError("Файл не является OLE-документом")
+        self.data = data
+
+        sector_shift, mini_sector_shift = struct.unpack_from("<HH", data, 0x1E)
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        (num_fat, first_dir, _, self.mini_cutoff, first_minifat,
+         _, first_difat, _) = struct.unpack_from("<8I", data, 0x2C)
+
+        fat_sectors = list(struct.unpack_from("<109I", data, 0x4C))
+        per_difat = self.sector_size // 4 - 1
+        for sector in self._walk(first_difat, None):
+            entries = struct.unpack(f"<{per_difat + 1}I", self._sector(sector))
+            fat_sectors.extend(entries[:per_difat])
+        fat_sectors = [s for s in fat_sectors if s <= MAXREGSECT][:num_fat]
+
+        self.fat = self._unpack_ids(b"".join(self._sector(s) for s in fat_sectors))
+        self.minifat = self._unpack_ids(self._read_chain(first_minifat, self.fat))
+
+        directory = self._read_chain(first_dir, self.fat)
+        self.entries = [directory[i:i + 128] for i in range(0, len(directory) - 127, 128)]
+        root = self._entry(0)
+        self.ministream = self._read_chain(root["start"], self.fat)[:root["size"]]
+
+    def _walk(self, start: int, fat: list):
+        """Обход цепочки секторов (без FAT — цепочка DIFAT задается самими секторами)"""
+        sector = start
+        seen = set()
+        while sector <= MAXREGSECT:
+            if sector in seen:
+                raise DocConversionError("Циклическая цепочка секторов")
+            seen.add(sector)
+            yield sector
+            if fat is None:
+                sector = struct.unpack_from("<I", self._sector(sector), self.sector_size - 4)[0]
+            elif sector < len(fat):
+                sector = fat[sector]
+            else:
+                raise DocConversionError("Цепочка секторов выходит за пределы FAT")
+
+    def _sector(self, sector: int) -> bytes:
+        offset = (sector + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    def _read_chain(self, start: int, fat: list) -> bytes:
+        return b"".join(self._sector(s) for s in self._walk(start, fat))
+
+    def _read_mini_chain(self, start: int) -> bytes:
+        size = self.mini_sector_size
+        return b"".join(
+            self.ministream[s * size:(s + 1) * size] for s in self._walk(start, self.minifat)
+        )
+
+    @staticmethod
+    def _unpack_ids(raw: bytes) -> list:
+        return list(struct.unpack(f"<{len(raw) // 4}I", raw[:len(raw) // 4 * 4]))
+
+    def _entry(self, index: int) -> dict:
+        raw = self.entries[index]
+        name_length = struct.unpack_from("<H", raw, 0x40)[0]
+        left, right, child = struct.unpack_from("<3I", raw, 0x44)
+        start, size = struct.unpack_from("<IQ", raw, 0x74)
+        if self.sector_size == 512:
+            size &= 0xFFFFFFFF
+        return {
+            "name": raw[:max(0, name_length - 2)].decode("utf-16-le", errors="replace"),
+            "type": raw[0x42],
+            "left": left,
+            "right": right,
+            "child": child,
+            "start": start,
+            "size": size,
+        }
+
+    def _root_children(self) -> list:
+        """Записи верхнего уровня (обход красно-черного дерева потомков корня)"""
+        children = []
+        stack = [self._entry(0)["child"]]
+        seen = set()
+        while stack:
+            index = stack.pop()
+            if index == NOSTREAM or index >= len(self.entries) or index in seen:
+                continue
+            seen.add(index)
+            entry = self._entry(index)
+            children.append(entry)
+            stack.extend((entry["left"], entry["right"]))
+        return children
+
+    def read_stream(self, name: str) -> bytes:
+        """Чтение потока верхнего уровня по имени"""
+        for entry in self._root_children():
+            if entry["type"] == STGTY_STREAM and entry["name"].lower() == name.lower():
+                if entry["size"] < self.mini_cutoff:
+                    data = self._read_mini_chain(entry["start"])
+                else:
+                    data = self._read_chain(entry["start"], self.fat)
+                return data[:entry["size"]]
+        raise DocConversionError(f"Поток {name} не найден")
+
+
+class OleDocTextExtractor(DocConverter):
+    """Извлечение текста из .doc (Word 97-2003) на чистом Python, без Word"""
+
+    name = "ole"
+
+    def extract_text(self, doc_path: str) -> str:
+        """Извлечение основного текста документа по таблице фрагментов (piece table)"""
+        logger.info(f"Чтение .doc файла (OLE): {os.path.basename(doc_path)}")
+        with open(doc_path, "rb") as f:
+            data = f.read()
+        try:
+            return self._extract(data)
+        except struct.error as e:
+            raise DocConversionError(f"Поврежденная структура документа: {str(e)}") from e
+
+    def _extract(self, data: bytes) -> str:
+        container = _CompoundFile(data)
+
+        word_stream = container.read_stream("WordDocument")
+        ident, nfib = struct.unpack_from("<HH", word_stream, 0)
+        if ident != WORD_IDENT:
+            raise DocConversionError("Поток WordDocument поврежден")
+        if nfib < MIN_WORD97_NFIB:
+            raise DocConversionError(f"Неподдерживаемая версия Word (nFib={nfib:#x})")
+
+        flags = struct.unpack_from("<H", word_stream, 0x0A)[0]
+        if flags & FIB_FLAG_ENCRYPTED:
+            raise DocConversionError("Документ защищен паролем")
+        table_stream = container.read_stream("1Table" if flags & FIB_FLAG_WHICH_TABLE else "0Table")
+
+        # FIB: FibBase (32 байта), затем fibRgW, fibRgLw и fibRgFcLcb переменной длины
+        pos = 32
+        csw = struct.unpack_from("<H", word_stream, pos)[0]
+        pos += 2 + csw * 2
+        cslw = struct.unpack_from("<H", word_stream, pos)[0]
+        ccp_text = struct.unpack_from("<i", word_stream, pos + 2 + 3 * 4)[0]
+        pos += 2 + cslw * 4
+        fc_clx, lcb_clx = struct.unpack_from("<II", word_stream, pos + 2 + FC_CLX_INDEX * 8)
+
+        pieces = self._read_piece_table(table_stream[fc_clx:fc_clx + lcb_clx])
+
+        parts = []
+        for cp_start, cp_end, fc_raw in pieces:
+            if ccp_text > 0:
+                if cp_start >= ccp_text:
+                    break
+                cp_end = min(cp_end, ccp_text)
+            count = cp_end - cp_start
+            if count <= 0:
+                continue
+            fc = fc_raw & FC_MASK
+            if fc_raw & FC_COMPRESSED:
+                offset = fc // 2
+                parts.append(word_stream[offset:offset + count].decode("cp1252", errors="replace"))
+            else:
+                parts.append(word_stream[fc:fc + 2 * count].decode("utf-16-le", errors="replace"))
+
+        return self._clean_text("".join(parts))
+
+    @staticmethod
+    def _read_piece_table(clx: bytes) -> list:
+        """Разбор Clx: пропуск Prc, чтение PlcPcd -> [(cp_start, cp_end, fc)]"""
+        pos = 0
+        while pos < len(clx):
+            kind = clx[pos]
+            if kind == 0x01:
+                cb_grpprl = struct.unpack_from("<h", clx, pos + 1)[0]
+                if cb_grpprl < 0 or pos + 3 + cb_grpprl > len(clx):
+                    raise DocConversionError("Поврежденный блок Prc в таблице фрагментов")
+                pos += 3 + cb_grpprl
+            elif kind == 0x02:
+                lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+                plc = clx[pos + 5:pos + 5 + lcb]
+                if lcb < 4 or len(plc) != lcb or (lcb - 4) % 12:
+                    raise DocConversionError("Поврежденная таблица фрагментов PlcPcd")
+                count = (lcb - 4) // 12
+                cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+                pieces = []
+                for i in range(count):
+                    fc_raw = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+                    pieces.append((cps[i], cps[i + 1], fc_raw))
+                return pieces
+            else:
+                break
+        raise DocConversionError("Таблица фрагментов текста не найдена")
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """Удаление кодов полей и управляющих символов Word"""
+        result = []
+        fields = []
+        for char in text:
+            if char == FIELD_BEGIN:
+                fields.append(False)
+            elif char == FIELD_SEPARATOR:
+                if fields:
+                    fields[-1] = True
+            elif char == FIELD_END:
+                if fields:
+                    fields.pop()
+            elif all(fields):
+                # Вне полей или в отображаемом результате поля
+                result.append(CONTROL_CHARS.get(char, char))
+        return CONTROL_CHARS_RE.sub("", "".join(result))
+
+
+def _com_initialize():
+    import pythoncom
+    pythoncom.CoInitialize()
+
+
+def _com_uninitialize():
+    import pythoncom
+    pythoncom.CoUninitialize()
+
+
+def _word_process_ids() -> set:
+    """PID всех запущенных WINWORD.EXE"""
+    import pywintypes
+    import win32api
+    import win32process
+
+    pids = set()
+    for pid in win32process.EnumProcesses():
+        try:
+            handle = win32api.OpenProcess(PROCESS_QUERY_INFORMATION | PROCESS_VM_READ, False, pid)
+        except pywintypes.error:
+            continue
+        try:
+            image = win32process.GetModuleFileNameEx(handle, 0)
+        except pywintypes.error:
+            continue
+        finally:
+            win32api.CloseHandle(handle)
+        if os.path.basename(image).lower() == WORD_PROCESS_NAME:
+            pids.add(pid)
+    return pids
+
+
+class _WordSession:
+    """Экземпляр Word с собственным COM-потоком
+
+    Поток daemon: зависший COM-вызов не блокирует завершение интерпретатора
+    (потоки ThreadPoolExecutor при выходе ожидаются).
+    """
+
+    def __init__(self):
+        self.word = None
+        self.pid = None
+        self.documents = 0
+        self._tasks = queue.Queue()
+        self.thread = threading.Thread(target=self._loop, name="word-com", daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        _com_initialize()
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                future, func, args = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            _com_uninitialize()
+
+    def submit(self, func, *args) -> Future:
+        future = Future()
+        self._tasks.put((future, self._run, (func, args)))
+        return future
+
+    def _run(self, func, args):
+        if self.word is None:
+            self._start()
+        return func(self.word, *args)
+
+    def _start(self):
+        import win32com.client
+
+        # PID нового процесса определяется по разнице списков WINWORD.EXE
+        try:
+            before = _word_process_ids()
+        except Exception as e:
+            logger.warning(f"Не удалось получить список процессов Word: {str(e)}")
+            before = None
+
+        # DispatchEx — отдельный процесс, не пересекающийся с Word пользователя
+        self.word = win32com.client.DispatchEx("Word.Application")
+        self.word.Visible = False
+        self.word.DisplayAlerts = 0
+
+        started = set()
+        if before is not None:
+            try:
+                started = _word_process_ids() - before
+            except Exception as e:
+                logger.warning(f"Не удалось получить список процессов Word: {str(e)}")
+        if len(started) == 1:
+            self.pid = started.pop()
+            logger.info(f"Запущен Word (PID {self.pid})")
+        else:
+            logger.warning(
+                "Запущен Word, но его PID не определен однозначно — "
+                "при зависании процесс не удастся завершить принудительно"
+            )
+
+    def ping(self, timeout: float) -> bool:
+        """Word отвечает на COM-вызовы"""
+        try:
+            self.submit(lambda word: word.Documents.Count).result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def quit(self, timeout: float) -> None:
+        try:
+            self.submit(lambda word: self._quit()).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Word не закрылся штатно: {str(e)}")
+            self.kill()
+        finally:
+            self.stop()
+
+    def _quit(self):
+        if self.word is not None:
+            self.word.Quit(SaveChanges=0)
+            self.word = None
+
+    def stop(self) -> None:
+        """Завершение COM-потока после текущей задачи"""
+        self._tasks.put(None)
+
+    def kill(self) -> None:
+        if self.pid:
+            try:
+                os.kill(self.pid, signal.SIGTERM)
+                logger.warning(f"Процесс Word (PID {self.pid}) принудительно завершен")
+            except OSError as e:
+                logger.warning(f"Не удалось завершить Word (PID {self.pid}): {str(e)}")
+        else:
+            logger.warning("PID Word неизвестен, зависший процесс может остаться запущенным")
+        self.stop()
+
+
+class WordComConverter(DocConverter):
+    """Конвертер через долгоживущую COM-сессию Word (только Windows)
+
+    Один экземпляр Word обслуживает все документы, операции выполняются с
+    таймаутом. Зависший или упавший Word завершается и при следующем вызове
+    запускается заново.
+    """
+
+    name = "word-com"
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_documents_per_session: int = 200):
+        self.timeout = timeout
+        self.max_documents_per_session = max_documents_per_session
+        self._session = None
+
+    @staticmethod
+    def is_available() -> bool:
+        """Установлены pywin32 и Microsoft Word"""
+        if os.name != "nt":
+            return False
+        try:
+            import pywintypes
+            import win32com.client  # noqa: F401
+            pywintypes.IID("Word.Application")
+            return True
+        except Exception:
+            return False
+
+    def _call(self, func, *args, timeout: float = None):
+        timeout = timeout or self.timeout
+        if self._session is None:
+            self._session = _WordSession()
+        session = self._session
+
+        future = session.submit(func, *args)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            # Зависание обычно вызвано самим документом, поэтому без повтора
+            self._drop_session(kill=True)
+            raise DocConversionError(f"Word не ответил за {timeout} сек")
+        except Exception as e:
+            if not session.ping(timeout=10):
+                self._drop_session(kill=True)
+                raise DocSessionError(f"Word перестал отвечать: {str(e)}") from e
+            raise DocConversionError(str(e)) from e
+
+        session.documents += 1
+        if session.documents >= self.max_documents_per_session:
+            # Периодический перезапуск ограничивает утечки памяти Word
+            self._drop_session(kill=False)
+        return result
+
+    def _drop_session(self, kill: bool) -> None:
+        session, self._session = self._session, None
+        if session is None:
+            return
+        if kill:
+            session.kill()
+        else:
+            session.quit(timeout=self.timeout)
+
+    @staticmethod
+    def _open(word, doc_path: str):
+        return word.Documents.Open(
+            FileName=os.path.abspath(doc_path),
+            ReadOnly=True,
+            ConfirmConversions=False,
+            AddToRecentFiles=False,
+            Visible=False
+        )
+
+    def extract_text(self, doc_path: str) -> str:
+        """Чтение текста .doc через Word"""
+        return self._call(self._extract_in_session, doc_path)
+
+    def convert_to_docx(self, doc_path: str, output_path: str = None) -> str:
+        """Конвертация .doc в .docx через Word с сохранением форматирования"""
+        return self._call(self._convert_in_session, doc_path, output_path)
+
+    def extract_batch(self, doc_paths: list, timeout: float = DEFAULT_TIMEOUT) -> dict:
+        return self._run_batch(self._extract_in_session, doc_paths, timeout, default="")
+
+    def convert_batch(self, doc_paths: list, timeout: float = DEFAULT_TIMEOUT) -> dict:
+        return self._run_batch(self._convert_in_session, doc_paths, timeout, default=None)
+
+    def _extract_in_session(self, word, doc_path: str) -> str:
+        logger.info(f"Чтение .doc файла (Word): {os.path.basename(doc_path)}")
+        doc = self._open(word, doc_path)
+        try:
+            return doc.Content.Text
+        finally:
+            doc.Close(SaveChanges=0)
+
+    def _convert_in_session(self, word, doc_path: str, output_path: str = None) -> str:
+        output_path = os.path.abspath(output_path or doc_path + "x")
+        logger.info(f"Конвертация: {os.path.basename(doc_path)} в .docx")
+        doc = self._open(word, doc_path)
+        try:
+            doc.SaveAs2(output_path, FileFormat=WD_FORMAT_DOCX)
+        finally:
+            doc.Close(SaveChanges=0)
+        return output_path
+
+    def close(self) -> None:
+        """Закрытие Word"""
+        self._drop_session(kill=False)
+
+
+def create_doc_converter(backend: str = "auto", timeout: float = DEFAULT_TIMEOUT) -> DocConverter:
+    """Выбор конвертера: 'word' (COM), 'ole' (чистый Python) или 'auto'"""
+    if backend == "word" or (backend == "auto" and WordComConverter.is_available()):
+        logger.info("Конвертер .doc: Microsoft Word (COM)")
+        return WordComConverter(timeout=timeout)
+    if backend in ("auto", "ole"):
+        logger.info("Конвертер .doc: встроенный OLE-парсер")
+        return OleDocTextExtractor()
+    raise ValueError(f"Неизвестный конвертер .doc: {backend}")
@@ -16,3 +16,6 @@ if __name__ == "__main__":
     
     # Для инкрементного обновления используйте:
     # vector_db.update_documents()
+
+    # Закрытие сессии Word (если .doc обрабатывались через COM)
+    vector_db.close()
@@ -0,0 +1,128 @@
+"""Сборка минимальных .doc (Word 97, OLE Compound File) для тестов
+
+Формирует только то, что читает OleDocTextExtractor: FIB, таблицу
+фрагментов в потоке 1Table и контейнер CFB с сектором 512 байт. Маленький
+поток таблицы попадает в mini stream, WordDocument — в обычные сектора,
+так что проверяются обе цепочки. Этим же модулем собран
+tests/fixtures/sample.doc:
+
+    python -m tests.doc_builder
+"""
+import os
+import struct
+
+SECTOR = 512
+MINI_SECTOR = 64
+MINI_CUTOFF = 4096
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+NOSTREAM = 0xFFFFFFFF
+
+SAMPLE_PIECES = [
+    # Сжатый фрагмент (cp1252): обычный текст и поле со скрытым кодом
+    ("Plain text. \x13 HYPERLINK \"http://kpfu.ru\" \x14KFU\x15 site.\r", True),
+    # Фрагмент UTF-16: кириллица и таблица из двух ячеек
+    ("Должность: инженер\rЯчейка 1\x07Ячейка 2\x07\x07", False),
+]
+SAMPLE_TEXT = "Plain text. KFU site.\nДолжность: инженер\nЯчейка 1\nЯчейка 2\n\n"
+
+
+def build_word_streams(pieces: list, nfib: int = 0xC1, flags: int = 0x0200) -> tuple:
+    """Потоки WordDocument и 1Table с FIB и piece table"""
+    fib = bytearray(32)
+    struct.pack_into("<HH", fib, 0, 0xA5EC, nfib)
+    struct.pack_into("<H", fib, 0x0A, flags)
+    fib += struct.pack("<H", 14) + bytes(14 * 2)
+    fib += struct.pack("<H", 22)
+    lw_offset = len(fib)
+    fib += bytes(22 * 4)
+    fib += struct.pack("<H", 93)
+    fc_offset = len(fib)
+    fib += bytes(93 * 8)
+
+    word = bytearray(fib) + bytes(1024 - len(fib))
+    cps, fcs = [0], []
+    for text, compressed in pieces:
+        offset = len(word)
+        if compressed:
+            word += text.encode("cp1252")
+            fcs.append((offset * 2) | 0x40000000)
+        else:
+            word += text.encode("utf-16-le")
+            fcs.append(offset)
+        cps.append(cps[-1] + len(text))
+    word += bytes(max(0, MINI_CUTOFF + 1 - len(word)))
+    struct.pack_into("<i", word, lw_offset + 3 * 4, cps[-1])
+
+    plc = struct.pack(f"<{len(cps)}I", *cps) + b"".join(struct.pack("<HIH", 0, fc, 0) for fc in fcs)
+    clx = b"\x01" + struct.pack("<h", 2) + b"\x00\x00" + b"\x02" + struct.pack("<I", len(plc)) + plc
+    table = bytes(8) + clx
+    struct.pack_into("<II", word, fc_offset + 33 * 8, 8, len(clx))
+    return bytes(word), table
+
+
+def _dir_entry(name: str, kind: int, start: int, size: int,
+               left=NOSTREAM, right=NOSTREAM, child=NOSTREAM) -> bytes:
+    entry = bytearray(128)
+    raw_name = name.encode("utf-16-le") + b"\x00\x00" if name else b""
+    entry[:len(raw_name)] = raw_name
+    struct.pack_into("<H", entry, 0x40, len(raw_name))
+    entry[0x42] = kind
+    struct.pack_into("<3I", entry, 0x44, left, right, child)
+    struct.pack_into("<IQ", entry, 0x74, start, size)
+    return bytes(entry)
+
+
+def build_compound_file(word: bytes, table: bytes, cyclic_fat: bool = False) -> bytes:
+    """Контейнер CFB с потоками WordDocument и 1Table"""
+    sectors, fat = [], []
+
+    def add_chain(data: bytes) -> int:
+        count = max(1, (len(data) + SECTOR - 1) // SECTOR)
+        start = len(sectors)
+        for i in range(count):
+            sectors.append(data[i * SECTOR:(i + 1) * SECTOR].ljust(SECTOR, b"\x00"))
+            fat.append(start + i + 1 if i < count - 1 else ENDOFCHAIN)
+        return start
+
+    word_start = add_chain(word)
+    if cyclic_fat:
+        fat[word_start + 1] = word_start
+
+    mini_count = (len(table) + MINI_SECTOR - 1) // MINI_SECTOR
+    ministream = table.ljust(mini_count * MINI_SECTOR, b"\x00")
+    minifat = [i + 1 if i < mini_count - 1 else ENDOFCHAIN for i in range(mini_count)]
+    ministream_start = add_chain(ministream)
+    minifat_start = add_chain(struct.pack(f"<{len(minifat)}I", *minifat))
+
+    directory = (
+        _dir_entry("Root Entry", 5, ministream_start, len(ministream), child=1)
+        + _dir_entry("WordDocument", 2, word_start, len(word), right=2)
+        + _dir_entry("1Table", 2, 0, len(table))
+        + _dir_entry("", 0, 0, 0)
+    )
+    dir_start = add_chain(directory)
+
+    fat_sector = len(sectors)
+    fat.append(FATSECT)
+    sectors.append(struct.pack(f"<{len(fat)}I", *fat).ljust(SECTOR, b"\xff"))
+
+    header = bytearray(SECTOR)
+    header[:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    struct.pack_into("<HHHH", header, 0x18, 0x3E, 3, 0xFFFE, 9)
+    struct.pack_into("<H", header, 0x20, 6)
+    struct.pack_into("<8I", header, 0x2C, 1, dir_start, 0, MINI_CUTOFF, minifat_start, 1, ENDOFCHAIN, 0)
+    struct.pack_into("<109I", header, 0x4C, fat_sector, *([0xFFFFFFFF] * 108))
+    return bytes(header) + b"".join(sectors)
+
+
+def build_doc(pieces: list = None, nfib: int = 0xC1, flags: int = 0x0200, cyclic_fat: bool = False) -> bytes:
+    word, table = build_word_streams(pieces or SAMPLE_PIECES, nfib=nfib, flags=flags)
+    return build_compound_file(word, table, cyclic_fat=cyclic_fat)
+
+
+if __name__ == "__main__":
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sample.doc")
+    with open(path, "wb") as f:
+        f.write(build_doc())
+    print(path)
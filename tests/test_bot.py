@@ -0,0 +1,176 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("telegram")
+
+import bot  # noqa: E402
+
+
+@pytest.fixture
+def background_init(monkeypatch):
+    """Фоновая инициализация с подменными шагами; сбрасывается после теста"""
+    monkeypatch.setattr(bot, "_init_futures", {})
+    monkeypatch.setattr(bot, "_init_executor", None)
+    yield
+    if bot._init_executor is not None:
+        bot._init_executor.shutdown(wait=True)
+
+
+def test_background_init_failure_is_logged_and_retried(monkeypatch, background_init, caplog):
+    attempts = []
+
+    def flaky_vector_db():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("база недоступна")
+
+    monkeypatch.setattr(bot, "init_llm_client", lambda: None)
+    monkeypatch.setattr(bot, "init_vector_db", flaky_vector_db)
+
+    bot.start_background_init()
+    # Колбэк логирования выполняется в рабочем потоке после завершения future
+    deadline = time.monotonic() + 5
+    while "база недоступна" not in caplog.text and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert "база недоступна" in caplog.text
+    assert not bot.system_ready()
+
+    asyncio.run(bot.wait_for_system_ready())
+    assert len(attempts) == 2
+    assert bot.system_ready()
+
+
+def test_wait_for_system_ready_raises_when_retry_fails(monkeypatch, background_init):
+    def broken():
+        raise RuntimeError("нет доступа")
+
+    monkeypatch.setattr(bot, "init_llm_client", lambda: None)
+    monkeypatch.setattr(bot, "init_vector_db", broken)
+
+    bot.start_background_init()
+    with pytest.raises(RuntimeError, match="нет доступа"):
+        asyncio.run(bot.wait_for_system_ready())
+    assert not bot.system_ready()
+
+
+class FakeStream:
+    """Поток чанков в формате openai с учетом прочитанного и close()"""
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for delta in self.deltas:
+            self.consumed += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, deltas):
+        self.stream = FakeStream(deltas)
+        self.params = None
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        self.params = params
+        return self.stream
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    def install(deltas):
+        client = FakeClient(deltas)
+        monkeypatch.setattr(bot, "deepseek_client", client)
+        monkeypatch.setattr(bot, "API_REQUEST_INTERVAL", 0)
+        return client
+    return install
+
+
+def feed_all(deltas):
+    parser = bot.ThinkStreamFilter()
+    for delta in deltas:
+        parser.feed(delta)
+    return parser
+
+
+def test_think_tag_split_across_deltas():
+    parser = feed_all(["<think>размышляю</th", "in", "k>ответ"])
+    assert parser.in_answer
+    assert parser.answer == "ответ"
+
+
+def test_partial_think_tag_is_not_answer_yet():
+    parser = feed_all(["<think>размышляю</thi"])
+    assert not parser.in_answer
+    assert not parser.ended
+
+
+def test_without_think_tag_whole_text_is_answer():
+    parser = feed_all(["просто ", "ответ"])
+    assert not parser.in_answer
+    assert parser.answer == "просто ответ"
+
+
+def test_end_marker_inside_think_is_ignored():
+    parser = feed_all(["<think>формат: 'ответ' <end> ", "думаю</think>", "ответ"])
+    assert parser.in_answer
+    assert not parser.ended
+    assert parser.answer == "ответ"
+
+
+def test_end_marker_after_think_ends_answer():
+    parser = feed_all(["<think>x</think>ответ <e", "nd> лишнее"])
+    assert parser.ended
+    assert parser.answer == "ответ "
+
+
+def test_stream_completion_stops_at_end_marker(fake_llm):
+    client = fake_llm(["<think>x</think>", "ответ", "<end>", "хвост", "еще хвост"])
+    parser = bot.stream_completion([], max_tokens=10, temperature=0)
+    assert parser.answer == "ответ"
+    assert client.stream.consumed == 3
+    assert client.stream.closed
+    assert client.params["stream"] is True
+
+
+def test_stream_completion_stops_when_complete(fake_llm):
+    client = fake_llm(["</think>", "да", "\n", "нет"])
+    bot.stream_completion([], max_tokens=10, temperature=0, is_complete=lambda answer: "\n" in answer)
+    assert client.stream.consumed == 3
+    assert client.stream.closed
+
+
+def test_stream_completion_closes_stream_on_error(fake_llm):
+    client = fake_llm(["</think>", "ответ"])
+
+    def on_update(parser):
+        raise RuntimeError("сбой")
+
+    with pytest.raises(RuntimeError):
+        bot.stream_completion([], max_tokens=10, temperature=0, on_update=on_update)
+    assert client.stream.closed
+
+
+def test_accusative_prefix_on_its_own_line(fake_llm):
+    client = fake_llm(["<think>x</think>\n", "родительный падеж:\n", "главного ", "инженера", "\n", "лишнее"])
+    assert bot.to_accusative_via_llm("главный инженер") == "главного инженера"
+    assert client.stream.consumed == 5
+
+
+def test_accusative_same_line_answer(fake_llm):
+    fake_llm(["</think> родительный падеж: \"ведущего методиста\""])
+    assert bot.to_accusative_via_llm("ведущий методист") == "ведущего методиста"
+
+
+def test_accusative_empty_answer_falls_back_to_phrase(fake_llm):
+    fake_llm(["</think>\n", "родительный падеж:\n"])
+    assert bot.to_accusative_via_llm("методист") == "методист"
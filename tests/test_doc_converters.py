@@ -0,0 +1,282 @@
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+import doc_converters
+from doc_converters import DocConversionError, DocSessionError, OleDocTextExtractor, WordComConverter
+from tests.doc_builder import SAMPLE_TEXT, build_doc
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE = os.path.join(FIXTURES, "sample.doc")
+
+
+@pytest.fixture
+def extractor():
+    return OleDocTextExtractor()
+
+
+def write_doc(tmp_path, data: bytes) -> str:
+    path = tmp_path / "test.doc"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_extract_text_fixture(extractor):
+    assert extractor.extract_text(FIXTURE) == SAMPLE_TEXT
+
+
+def test_extract_text_field_result_kept_and_code_dropped(extractor):
+    text = extractor.extract_text(FIXTURE)
+    assert "KFU" in text
+    assert "HYPERLINK" not in text
+
+
+def test_extract_text_table_cells_on_separate_lines(extractor):
+    lines = extractor.extract_text(FIXTURE).split("\n")
+    assert "Ячейка 1" in lines
+    assert "Ячейка 2" in lines
+
+
+def test_extract_text_saved_by_word(extractor):
+    path = os.path.join(FIXTURES, "word97_olefile.doc")
+    assert extractor.extract_text(path) == "Test OLE file, saved as Word 97-2003 Document.\n"
+
+
+def test_extract_text_saved_by_word_2016(extractor):
+    lines = extractor.extract_text(os.path.join(FIXTURES, "word2016_oletools.doc")).split("\n")
+    assert lines[:3] == ["Test", "", "This is a harmless test document."]
+    assert "we add some ünicöde-ßtringß and different text sizes, colors and fonts" in lines[-2]
+
+
+def test_encrypted_document_saved_by_word(extractor):
+    with pytest.raises(DocConversionError, match="паролем"):
+        extractor.extract_text(os.path.join(FIXTURES, "word_encrypted_oletools.doc"))
+
+
+def test_extract_text_compressed_piece(extractor, tmp_path):
+    path = write_doc(tmp_path, build_doc([("Caf\xe9 “quoted”\r", True)]))
+    assert extractor.extract_text(path) == "Caf\xe9 “quoted”\n"
+
+
+def test_extract_text_utf16_piece(extractor, tmp_path):
+    path = write_doc(tmp_path, build_doc([("Главный инженер\r", False)]))
+    assert extractor.extract_text(path) == "Главный инженер\n"
+
+
+def test_clean_text_nested_fields():
+    text = "a\x13 OUTER \x13 INNER \x14inner\x15 code \x14outer\x15b"
+    assert OleDocTextExtractor._clean_text(text) == "aouterb"
+
+
+def test_clean_text_nested_field_result():
+    text = "\x13 OUTER \x14x\x13 INNER \x14y\x15z\x15"
+    assert OleDocTextExtractor._clean_text(text) == "xyz"
+
+
+def test_clean_text_control_chars():
+    assert OleDocTextExtractor._clean_text("a\x0bb\x1ec\x1fd\x01e\xa0f") == "a\nb-cde f"
+
+
+def test_non_ole_file(extractor, tmp_path):
+    path = write_doc(tmp_path, b"PK\x03\x04 not a doc")
+    with pytest.raises(DocConversionError, match="OLE"):
+        extractor.extract_text(path)
+
+
+def test_encrypted_document(extractor, tmp_path):
+    path = write_doc(tmp_path, build_doc(flags=0x0200 | 0x0100))
+    with pytest.raises(DocConversionError, match="паролем"):
+        extractor.extract_text(path)
+
+
+def test_pre_word97_nfib(extractor, tmp_path):
+    path = write_doc(tmp_path, build_doc(nfib=0x65))
+    with pytest.raises(DocConversionError, match="версия"):
+        extractor.extract_text(path)
+
+
+def test_cyclic_fat(extractor, tmp_path):
+    path = write_doc(tmp_path, build_doc(cyclic_fat=True))
+    with pytest.raises(DocConversionError, match="Циклическая"):
+        extractor.extract_text(path)
+
+
+@pytest.mark.parametrize("clx", [
+    b"\x01" + struct.pack("<h", -3) + b"\x00" * 10,
+    b"\x01" + struct.pack("<h", 100) + b"\x00" * 10,
+    b"\x02" + struct.pack("<I", 1000) + b"\x00" * 16,
+    b"\x02" + struct.pack("<I", 9) + b"\x00" * 9,
+])
+def test_corrupt_piece_table(clx):
+    with pytest.raises(DocConversionError):
+        OleDocTextExtractor._read_piece_table(clx)
+
+
+def test_extract_batch_reports_errors_per_file(extractor, tmp_path):
+    bad = tmp_path / "bad.doc"
+    bad.write_bytes(b"garbage")
+    results = extractor.extract_batch([FIXTURE, str(bad)])
+    assert results == {FIXTURE: SAMPLE_TEXT, str(bad): ""}
+
+
+def test_batch_timeout(extractor):
+    start = time.monotonic()
+    results = extractor._run_batch(lambda path: time.sleep(5), ["slow.doc"], timeout=0.2, default="")
+    assert results == {"slow.doc": ""}
+    assert time.monotonic() - start < 2
+
+
+class FakeDocument:
+    def __init__(self, text: str):
+        self.Content = types.SimpleNamespace(Text=text)
+
+    def Close(self, SaveChanges=0):
+        pass
+
+
+class FakeDocuments:
+    """Поведение Documents.Open задается именем файла"""
+
+    def __init__(self, word):
+        self.word = word
+
+    @property
+    def Count(self):
+        if self.word.crashed:
+            raise RuntimeError("RPC server is unavailable")
+        return 0
+
+    def Open(self, FileName, **kwargs):
+        name = os.path.basename(FileName)
+        self.word.opened.append(name)
+        if name == "hang.doc":
+            self.word.release.wait()
+        elif name == "broken.doc":
+            raise RuntimeError("документ поврежден")
+        elif name == "crash.doc":
+            self.word.crashed = True
+            raise RuntimeError("RPC server is unavailable")
+        return FakeDocument(f"текст {name}")
+
+
+class FakeWord:
+    def __init__(self, release: threading.Event):
+        self.release = release
+        self.opened = []
+        self.crashed = False
+        self.quit = False
+        self.Documents = FakeDocuments(self)
+
+    def Quit(self, SaveChanges=0):
+        self.quit = True
+
+
+@pytest.fixture
+def word(monkeypatch):
+    """WordComConverter с поддельным Word вместо COM"""
+    state = types.SimpleNamespace(started=[], killed=[], sessions=[], release=threading.Event())
+
+    def start(session):
+        session.word = FakeWord(state.release)
+        session.pid = 1000 + len(state.started)
+        state.started.append(session.word)
+        state.sessions.append(session)
+
+    monkeypatch.setattr(doc_converters, "_com_initialize", lambda: None)
+    monkeypatch.setattr(doc_converters, "_com_uninitialize", lambda: None)
+    monkeypatch.setattr(doc_converters._WordSession, "_start", start)
+    monkeypatch.setattr(doc_converters.os, "kill", lambda pid, sig: state.killed.append(pid))
+    yield state
+    # Зависшие потоки должны завершиться до отката monkeypatch
+    state.release.set()
+    for session in state.sessions:
+        session.stop()
+        session.thread.join(timeout=5)
+
+
+def test_word_extract_text(word):
+    converter = WordComConverter(timeout=5)
+    assert converter.extract_text("a.doc") == "текст a.doc"
+    assert converter.extract_text("b.doc") == "текст b.doc"
+    assert len(word.started) == 1
+    converter.close()
+    assert word.started[0].quit
+    assert word.killed == []
+
+
+def test_word_timeout_kills_session(word):
+    converter = WordComConverter(timeout=0.2)
+    converter._call(lambda w: None)
+    session = converter._session
+
+    start = time.monotonic()
+    with pytest.raises(DocConversionError, match="не ответил"):
+        converter.extract_text("hang.doc")
+    assert time.monotonic() - start < 2
+    assert word.killed == [1000]
+    assert converter._session is None
+    assert session.thread.daemon
+
+    assert converter.extract_text("a.doc") == "текст a.doc"
+    assert len(word.started) == 2
+    converter.close()
+
+
+def test_word_document_error_keeps_session(word):
+    converter = WordComConverter(timeout=5)
+    results = converter.extract_batch(["broken.doc", "a.doc"], timeout=5)
+    assert results == {"broken.doc": "", "a.doc": "текст a.doc"}
+    assert word.started[0].opened == ["broken.doc", "a.doc"]
+    assert word.killed == []
+
+
+def test_word_failed_ping_raises_session_error(word):
+    converter = WordComConverter(timeout=5)
+    with pytest.raises(DocSessionError):
+        converter.extract_text("crash.doc")
+    assert word.killed == [1000]
+    assert converter._session is None
+
+
+def test_word_batch_retries_once_after_session_error(word):
+    converter = WordComConverter(timeout=5)
+    results = converter.extract_batch(["crash.doc", "a.doc"], timeout=5)
+    assert results == {"crash.doc": "", "a.doc": "текст a.doc"}
+    # Две попытки на crash.doc, каждая в новом Word, затем a.doc в третьем
+    assert [w.opened for w in word.started] == [["crash.doc"], ["crash.doc"], ["a.doc"]]
+    assert word.killed == [1000, 1001]
+
+
+def test_word_session_recycled(word):
+    converter = WordComConverter(timeout=5, max_documents_per_session=2)
+    results = converter.extract_batch(["a.doc", "b.doc", "c.doc"], timeout=5)
+    assert list(results.values()) == ["текст a.doc", "текст b.doc", "текст c.doc"]
+    assert [w.opened for w in word.started] == [["a.doc", "b.doc"], ["c.doc"]]
+    assert word.started[0].quit
+    assert word.killed == []
+
+
+@pytest.mark.parametrize("before, after, pid", [
+    ({10}, {10, 42}, 42),
+    ({10}, {10}, None),
+    ({10}, {10, 42, 43}, None),
+])
+def test_word_start_pid_from_process_diff(monkeypatch, caplog, before, after, pid):
+    snapshots = iter([before, after])
+    client = types.SimpleNamespace(DispatchEx=lambda prog_id: types.SimpleNamespace())
+    monkeypatch.setitem(sys.modules, "win32com", types.SimpleNamespace(client=client))
+    monkeypatch.setitem(sys.modules, "win32com.client", client)
+    monkeypatch.setattr(doc_converters, "_word_process_ids", lambda: next(snapshots))
+
+    session = doc_converters._WordSession.__new__(doc_converters._WordSession)
+    session.word = session.pid = None
+    with caplog.at_level(logging.WARNING, logger="doc_converters"):
+        session._start()
+    assert session.pid == pid
+    assert ("PID не определен" in caplog.text) == (pid is None)
@@ -1,18 +1,12 @@
 import os
 import re
-import json
-from docx import Document
-import chromadb
-from chromadb.utils import embedding_functions
 import hashlib
-import win32com.client
 import time
 import logging
 import traceback
-from docx.shared import Pt
-import PyPDF2
 import textwrap
 from collections import deque
+from doc_converters import DEFAULT_TIMEOUT, create_doc_converter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,13 +19,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class VectorRAGDatabase:
-    def __init__(self, documents_dir: str, vector_db_path: str):
+    def __init__(self, documents_dir: str, vector_db_path: str,
+                 doc_converter=None, doc_timeout: float = DEFAULT_TIMEOUT,
+                 embedding_function=None):
         """Конструктор класса, принимающий обязательные аргументы"""
         self.documents_dir = documents_dir
         self.vector_db_path = vector_db_path
+        self._doc_converter = doc_converter
+        self.doc_timeout = doc_timeout
         
+        import chromadb
+        from chromadb.utils import embedding_functions
+
         self.client = chromadb.PersistentClient(path=vector_db_path)
-        self.embedding_func = embedding_functions.DefaultEmbeddingFunction()
+        self.embedding_func = embedding_function or embedding_functions.DefaultEmbeddingFunction()
         
         self.collection = self.client.get_or_create_collection(
             name="documents",
@@ -39,54 +40,33 @@ class VectorRAGDatabase:
         )
         logger.info(f"Векторная база инициализирована. Путь: {vector_db_path}")
 
-    def convert_doc_to_docx(self, doc_path: str) -> str:
-        """Конвертирует .doc в .docx"""
-        try:
-            logger.info(f"Конвертация: {os.path.basename(doc_path)} в .docx")
-            word = win32com.client.Dispatch("Word.Application")
-            word.visible = False
-            word.DisplayAlerts = False
-            
-            doc = word.Documents.Open(doc_path)
-            new_path = doc_path + "x"
-            doc.SaveAs2(new_path, FileFormat=16)
-            doc.Close()
-            word.Quit()
-            
-            os.remove(doc_path)
-            logger.info(f"Успешно сконвертирован: {os.path.basename(doc_path)} -> {os.path.basename(new_path)}")
-            return new_path
-        except Exception as e:
-            logger.error(f"Ошибка конвертации: {str(e)}")
-            return doc_path
+    @property
+    def doc_converter(self):
+        """Конвертер .doc (создается при первом обращении)"""
+        if self._doc_converter is None:
+            self._doc_converter = create_doc_converter(timeout=self.doc_timeout)
+        return self._doc_converter
 
     def read_doc(self, file_path: str) -> str:
         """Чтение .doc файла"""
-        try:
-            logger.info(f"Чтение .doc файла: {os.path.basename(file_path)}")
-            word = win32com.client.Dispatch("Word.Application")
-            word.visible = False
-            word.DisplayAlerts = False
-            
-            doc = word.Documents.Open(
-                FileName=file_path,
-                ReadOnly=True,
-                ConfirmConversions=False,
-                AddToRecentFiles=False
-            )
-            
-            text = doc.Content.Text
-            doc.Close()
-            word.Quit()
-            
-            return text
-        except Exception as e:
-            logger.error(f"Ошибка чтения .doc: {str(e)}")
-            return ""
+        return self.read_doc_batch([file_path])[file_path]
+
+    def read_doc_batch(self, file_paths: list) -> dict:
+        """Чтение набора .doc файлов одной сессией конвертера: {путь: текст}"""
+        if not file_paths:
+            return {}
+        return self.doc_converter.extract_batch(file_paths, timeout=self.doc_timeout)
+
+    def close(self):
+        """Освобождение ресурсов (закрытие сессии Word)"""
+        if self._doc_converter is not None:
+            self._doc_converter.close()
 
     def read_docx(self, file_path: str) -> str:
         """Чтение .docx файла"""
         try:
+            from docx import Document
+
             logger.info(f"Чтение .docx файла: {os.path.basename(file_path)}")
             doc = Document(file_path)
             return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
@@ -97,6 +77,8 @@ class VectorRAGDatabase:
     def read_pdf(self, file_path: str) -> str:
         """Чтение PDF файла"""
         try:
+            import PyPDF2
+
             logger.info(f"Чтение PDF файла: {os.path.basename(file_path)}")
             text = ""
             with open(file_path, 'rb') as file:
@@ -181,18 +163,10 @@ class VectorRAGDatabase:
             logger.info("Новых файлов для обработки не найдено")
             return 0, 0
 
-        files_to_process = []
-        for filename in new_files:
-            if filename.lower().endswith('.doc'):
-                file_path = os.path.join(self.documents_dir, filename)
-                new_path = self.convert_doc_to_docx(file_path)
-                if new_path != file_path:
-                    new_filename = os.path.basename(new_path)
-                    files_to_process.append(new_filename)
-                else:
-                    files_to_process.append(filename)
-            else:
-                files_to_process.append(filename)
+        files_to_process = new_files
+        doc_texts = self.read_doc_batch([
+            os.path.join(self.documents_dir, f) for f in files_to_process if f.lower().endswith('.doc')
+        ])
 
         processed_files = 0
         total_chunks = 0
@@ -205,7 +179,7 @@ class VectorRAGDatabase:
                 start_time = time.time()
                 
                 if filename.lower().endswith('.doc'):
-                    text = self.read_doc(file_path)
+                    text = doc_texts.get(file_path, "")
                 elif filename.lower().endswith('.docx'):
                     text = self.read_docx(file_path)
                 elif filename.lower().endswith('.pdf'):
@@ -253,13 +227,9 @@ class VectorRAGDatabase:
             if f.endswith(supported_formats) and not f.startswith(('~$',))
         ]
         
-        for filename in files_to_process[:]:
-            if filename.endswith('.doc'):
-                file_path = os.path.join(self.documents_dir, filename)
-                new_path = self.convert_doc_to_docx(file_path)
-                if new_path != file_path:
-                    new_filename = os.path.basename(new_path)
-                    files_to_process[files_to_process.index(filename)] = new_filename
+        doc_texts = self.read_doc_batch([
+            os.path.join(self.documents_dir, f) for f in files_to_process if f.endswith('.doc')
+        ])
         
         for filename in files_to_process:
             file_path = os.path.join(self.documents_dir, filename)
@@ -269,7 +239,7 @@ class VectorRAGDatabase:
                 start_time = time.time()
                 
                 if filename.endswith('.doc'):
-                    text = self.read_doc(file_path)
+                    text = doc_texts.get(file_path, "")
                 elif filename.endswith('.docx'):
                     text = self.read_docx(file_path)
                 elif filename.endswith('.pdf'):